@@ -1,8 +1,40 @@
 import sqlite3
-import pickle
 import os
+import uuid
 from datetime import datetime, date
-from typing import List, Tuple, Optional, Dict
+from typing import Iterator, List, Tuple, Optional
+
+import numpy as np
+
+
+# Face encodings are stored as raw float32 bytes
+FACE_ENCODING_DIM = 128
+FACE_ENCODING_DTYPE = np.float32
+FACE_ENCODING_BYTES = FACE_ENCODING_DIM * np.dtype(FACE_ENCODING_DTYPE).itemsize
+
+# The encodings sidecar file starts with a magic string and a 16-byte token that
+# must match encoding_store.token in SQLite; the raw float32 rows follow
+ENCODING_STORE_MAGIC = b'FENC0001'
+ENCODING_STORE_HEADER_BYTES = len(ENCODING_STORE_MAGIC) + 16
+
+# Bump whenever a new one-time migration is added to _migrate()
+SCHEMA_VERSION = 2
+
+# Hot-path statements; reusing the same string objects keeps sqlite3's
+# per-connection statement cache hitting instead of re-preparing them
+_SQL_UPSERT_ATTENDANCE = '''
+    INSERT INTO attendance (person_id, date, time_in, status)
+    VALUES (?, ?, ?, 'present')
+    ON CONFLICT (person_id, date) DO UPDATE SET time_out = excluded.time_in
+'''
+_SQL_PERSON_ID_BY_NAME = 'SELECT id FROM people WHERE name = ?'
+_SQL_ATTENDANCE_BY_DATE = '''
+    SELECT p.name, p.role, a.time_in, a.time_out, a.status
+    FROM attendance a
+    JOIN people p ON a.person_id = p.id
+    WHERE a.date = ?
+    ORDER BY p.name
+'''
 
 
 class DatabaseManager:
@@ -11,10 +43,29 @@ class DatabaseManager:
     def __init__(self, db_path: str = "data/database/attendance.db"):
         """Initialize database connection and create tables if they don't exist."""
         self.db_path = db_path
+        # All encodings are also kept back to back in a raw float32 sidecar file,
+        # so the recognizer can memory-map them instead of reading one BLOB per person
+        self.encodings_path = os.path.splitext(db_path)[0] + "_encodings.f32"
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._configure_connection()
+        # Rows support both index and column-name access (row[0] / row['name'])
+        self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
+        # Bumped on every change to the people table; get_all_people() caches per generation
+        self._people_gen = 0
+        self._people_cache = None
         self._create_tables()
+        self._migrate()
+        self._check_encoding_store()
+
+    def _configure_connection(self):
+        """Tune SQLite for frequent small writes from the recognition loop."""
+        # WAL + NORMAL sync avoids an fsync on every attendance commit
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-20000')
 
     def _create_tables(self):
         """Create necessary tables for the attendance system."""
@@ -26,7 +77,8 @@ class DatabaseManager:
                 role TEXT NOT NULL,
                 face_encoding BLOB NOT NULL,
                 image_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                matrix_row INTEGER
             )
         ''')
 
@@ -44,8 +96,159 @@ class DatabaseManager:
             )
         ''')
 
+        # Token of the encodings sidecar file this database's matrix_row values point into
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS encoding_store (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                token BLOB NOT NULL
+            )
+        ''')
+
+        # Indexes (UNIQUE(person_id, date) already covers the per-person lookup)
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_people_name ON people (name)')
+        # Lets the case-insensitive LIKE prefix search in search_people() use an index
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_people_name_nocase ON people (name COLLATE NOCASE)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance (date)')
+
         self.conn.commit()
 
+    def _migrate(self):
+        """Run one-time data migrations based on the stored schema version."""
+        self.cursor.execute('PRAGMA user_version')
+        version = self.cursor.fetchone()[0]
+
+        if version < 1:
+            self._migrate_pickled_encodings()
+
+        if version < 2:
+            self._migrate_add_matrix_row()
+
+        if version < SCHEMA_VERSION:
+            self.cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self.conn.commit()
+
+    def _migrate_pickled_encodings(self):
+        """Rewrite legacy pickle-serialized face encodings as raw float32 bytes."""
+        # Only databases created before the raw format need pickle
+        import pickle
+
+        self.cursor.execute('''
+            SELECT id, face_encoding FROM people WHERE length(face_encoding) != ?
+        ''', (FACE_ENCODING_BYTES,))
+        legacy_rows = self.cursor.fetchall()
+
+        for person_id, encoding_blob in legacy_rows:
+            face_encoding = pickle.loads(encoding_blob)
+            self.cursor.execute('UPDATE people SET face_encoding = ? WHERE id = ?',
+                                (self._encode_face(face_encoding), person_id))
+
+        if legacy_rows:
+            print(f"Migrated {len(legacy_rows)} face encodings to raw float32 format.")
+
+    def _migrate_add_matrix_row(self):
+        """Add the people.matrix_row column pointing into the encodings sidecar file."""
+        self.cursor.execute('PRAGMA table_info(people)')
+        columns = [row['name'] for row in self.cursor.fetchall()]
+
+        if 'matrix_row' not in columns:
+            self.cursor.execute('ALTER TABLE people ADD COLUMN matrix_row INTEGER')
+        # Existing rows get their matrix_row from _check_encoding_store()
+
+    def _encoding_store_rows(self) -> int:
+        """Number of complete encodings in the sidecar file."""
+        if not os.path.exists(self.encodings_path):
+            return 0
+        data_bytes = os.path.getsize(self.encodings_path) - ENCODING_STORE_HEADER_BYTES
+        return max(data_bytes, 0) // FACE_ENCODING_BYTES
+
+    def _read_encoding_store_token(self) -> Optional[bytes]:
+        """Token from the sidecar file header, or None if the file is missing or not ours."""
+        try:
+            with open(self.encodings_path, 'rb') as f:
+                header = f.read(ENCODING_STORE_HEADER_BYTES)
+        except OSError:
+            return None
+
+        if len(header) != ENCODING_STORE_HEADER_BYTES or not header.startswith(ENCODING_STORE_MAGIC):
+            return None
+        return header[len(ENCODING_STORE_MAGIC):]
+
+    def _check_encoding_store(self):
+        """Rebuild the encodings sidecar file from the BLOBs if it is missing or stale."""
+        # The sidecar is only rewritten (and renumbered) by a rebuild, which issues a new
+        # token; appends keep earlier rows intact. A token mismatch therefore means the
+        # database and the sidecar were not saved together (e.g. one restored from backup).
+        self.cursor.execute('SELECT token FROM encoding_store WHERE id = 1')
+        row = self.cursor.fetchone()
+
+        if row is not None and row['token'] == self._read_encoding_store_token():
+            self.cursor.execute('''
+                SELECT COUNT(*), MAX(matrix_row), COUNT(DISTINCT matrix_row) FROM people
+            ''')
+            total, max_row, distinct_rows = self.cursor.fetchone()
+
+            # Healthy means people own rows 0..total-1 exactly, which keeps
+            # get_encoding_matrix() zero-copy. Removals leave gaps and failed adds
+            # leave orphan rows, so those are compacted here on the next start.
+            if total == 0 and self._encoding_store_rows() == 0:
+                return
+            if (distinct_rows == total and max_row == total - 1
+                    and self._encoding_store_rows() == total):
+                return
+
+        self._rebuild_encoding_store()
+
+    def _rebuild_encoding_store(self):
+        """Rewrite the sidecar file under a new token and renumber matrix_row."""
+        # Hold the write lock throughout, so another instance cannot add someone meanwhile
+        self.cursor.execute('BEGIN IMMEDIATE')
+        self.cursor.execute('SELECT id, face_encoding FROM people ORDER BY id')
+        rows = self.cursor.fetchall()
+        token = uuid.uuid4().bytes
+
+        tmp_path = self.encodings_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(ENCODING_STORE_MAGIC + token)
+            for matrix_row, (person_id, encoding_blob) in enumerate(rows):
+                f.write(encoding_blob)
+                self.cursor.execute('UPDATE people SET matrix_row = ? WHERE id = ?',
+                                    (matrix_row, person_id))
+        self.cursor.execute('''
+            INSERT INTO encoding_store (id, token) VALUES (1, ?)
+            ON CONFLICT (id) DO UPDATE SET token = excluded.token
+        ''', (token,))
+
+        # A crash between these two leaves the tokens mismatched, so the next start rebuilds again
+        os.replace(tmp_path, self.encodings_path)
+        self.conn.commit()
+
+    def _begin_encoding_store_write(self) -> int:
+        """Take the database write lock and return the next free row in the sidecar file."""
+        # Rows are only appended at the end of the file (never reused until a rebuild),
+        # and choosing the row while holding the lock keeps concurrent writers (another
+        # app instance, an import script) from claiming the same one
+        self.cursor.execute('BEGIN IMMEDIATE')
+        return self._encoding_store_rows()
+
+    def _write_to_encoding_store(self, matrix_row: int, encoding_blob: bytes):
+        """Write one or more back-to-back encodings starting at the given row of the sidecar file."""
+        # The file (with its header) always exists once _check_encoding_store() has run
+        with open(self.encodings_path, 'r+b') as f:
+            f.seek(ENCODING_STORE_HEADER_BYTES + matrix_row * FACE_ENCODING_BYTES)
+            f.write(encoding_blob)
+            # Drop any partially written row left behind by an earlier failure
+            f.truncate()
+
+    @staticmethod
+    def _encode_face(face_encoding) -> bytes:
+        """Serialize a face encoding to raw float32 bytes."""
+        return np.ascontiguousarray(face_encoding, dtype=FACE_ENCODING_DTYPE).tobytes()
+
+    @staticmethod
+    def _decode_face(encoding_blob: bytes) -> np.ndarray:
+        """Deserialize raw float32 bytes into a face encoding."""
+        return np.frombuffer(encoding_blob, dtype=FACE_ENCODING_DTYPE)
+
     def add_person(self, name: str, role: str, face_encoding, image_path: str = None) -> bool:
         """
         Add a new person to the database.
@@ -61,22 +264,68 @@ class DatabaseManager:
         """
         try:
             # Serialize face encoding
-            encoding_blob = pickle.dumps(face_encoding)
+            encoding_blob = self._encode_face(face_encoding)
+            matrix_row = self._begin_encoding_store_write()
 
             self.cursor.execute('''
-                INSERT INTO people (name, role, face_encoding, image_path)
-                VALUES (?, ?, ?, ?)
-            ''', (name, role, encoding_blob, image_path))
+                INSERT INTO people (name, role, face_encoding, image_path, matrix_row)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (name, role, encoding_blob, image_path, matrix_row))
+
+            # Only commit once the sidecar file has the encoding too
+            self._write_to_encoding_store(matrix_row, encoding_blob)
 
             self.conn.commit()
+            self._people_gen += 1
             return True
         except sqlite3.IntegrityError:
+            self.conn.rollback()
             print(f"Error: Person with name '{name}' already exists!")
             return False
         except Exception as e:
+            self.conn.rollback()
             print(f"Error adding person: {e}")
             return False
 
+    def add_people_bulk(self, people: List[Tuple[str, str, np.ndarray, Optional[str]]]) -> bool:
+        """
+        Add several people to the database in a single transaction.
+
+        Args:
+            people: List of tuples (name, role, face_encoding, image_path)
+
+        Returns:
+            True if all were added, False otherwise (nobody is added)
+        """
+        if not people:
+            return True
+
+        try:
+            encoding_blobs = [self._encode_face(face_encoding) for _, _, face_encoding, _ in people]
+
+            # One transaction for all rows, so one commit instead of one per person
+            start_row = self._begin_encoding_store_write()
+            self.cursor.executemany('''
+                INSERT INTO people (name, role, face_encoding, image_path, matrix_row)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(name, role, encoding_blob, image_path, start_row + i)
+                  for i, ((name, role, _, image_path), encoding_blob)
+                  in enumerate(zip(people, encoding_blobs))])
+
+            self._write_to_encoding_store(start_row, b''.join(encoding_blobs))
+
+            self.conn.commit()
+            self._people_gen += 1
+            return True
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            print(f"Error: Duplicate person in bulk import ({e})!")
+            return False
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error adding people: {e}")
+            return False
+
     def remove_person(self, name: str) -> bool:
         """
         Remove a person from the database.
@@ -101,14 +350,66 @@ class DatabaseManager:
             self.cursor.execute('DELETE FROM people WHERE id = ?', (person_id,))
 
             self.conn.commit()
+            self._people_gen += 1
             return True
         except Exception as e:
+            self.conn.rollback()
             print(f"Error removing person: {e}")
             return False
 
-    def get_all_people(self) -> List[Tuple]:
-        """Get all people from the database."""
-        self.cursor.execute('SELECT id, name, role, created_at FROM people ORDER BY name')
+    def get_all_people(self) -> Tuple[Tuple, ...]:
+        """
+        Get all people from the database.
+
+        The result is cached until the next add/remove, so it is returned as a
+        tuple to keep callers from mutating the shared list.
+        """
+        if self._people_cache is None or self._people_cache[0] != self._people_gen:
+            self.cursor.execute('SELECT id, name, role, created_at FROM people ORDER BY name')
+            self._people_cache = (self._people_gen, tuple(self.cursor.fetchall()))
+        return self._people_cache[1]
+
+    def iter_people(self, page_size: int = 50) -> Iterator[List[Tuple]]:
+        """
+        Lazily page through all people ordered by name.
+
+        Args:
+            page_size: Number of people fetched per page
+
+        Yields:
+            Lists of up to page_size tuples (id, name, role, created_at)
+        """
+        offset = 0
+        while True:
+            self.cursor.execute('''
+                SELECT id, name, role, created_at FROM people ORDER BY name LIMIT ? OFFSET ?
+            ''', (page_size, offset))
+            page = self.cursor.fetchall()
+            if not page:
+                return
+            yield page
+            offset += len(page)
+
+    def search_people(self, prefix: str, limit: int = 20) -> List[Tuple]:
+        """
+        Find people whose name starts with a prefix (case-insensitive).
+
+        Args:
+            prefix: Start of the name
+            limit: Maximum number of people returned
+
+        Returns:
+            List of tuples (id, name, role), ordered by name
+        """
+        # Escape LIKE wildcards typed by the user; the pattern is bound as a single
+        # parameter so SQLite can turn it into a range on idx_people_name_nocase
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        self.cursor.execute('''
+            SELECT id, name, role FROM people
+            WHERE name LIKE ? ESCAPE '\\'
+            ORDER BY name
+            LIMIT ?
+        ''', (pattern, limit))
         return self.cursor.fetchall()
 
     def get_person_by_name(self, name: str) -> Optional[Tuple]:
@@ -127,13 +428,94 @@ class DatabaseManager:
         results = []
         for row in self.cursor.fetchall():
             person_id, name, encoding_blob = row
-            face_encoding = pickle.loads(encoding_blob)
+            face_encoding = self._decode_face(encoding_blob)
             results.append((person_id, name, face_encoding))
         return results
 
+    def get_people_version(self) -> Tuple[int, Optional[int], Optional[str]]:
+        """
+        Get a cheap fingerprint of the people table for cache invalidation.
+
+        Returns:
+            Tuple of (people_count, max_id, max_created_at)
+        """
+        self.cursor.execute('SELECT COUNT(*), MAX(id), MAX(created_at) FROM people')
+        return tuple(self.cursor.fetchone())
+
+    def get_encoding_matrix(self) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Get all face encodings as one matrix memory-mapped from the sidecar file.
+
+        Returns:
+            Tuple of (person_ids, names, encodings) where encodings is an
+            (N, 128) float32 array whose rows line up with person_ids/names
+        """
+        # Open the file before querying: if another instance rebuilds it in between,
+        # the header token no longer matches and the BLOBs are used instead
+        with open(self.encodings_path, 'rb') as f:
+            header = f.read(ENCODING_STORE_HEADER_BYTES)
+            file_rows = ((os.fstat(f.fileno()).st_size - ENCODING_STORE_HEADER_BYTES)
+                         // FACE_ENCODING_BYTES)
+
+            # One statement, so people and token come from the same snapshot
+            self.cursor.execute('''
+                SELECT p.id, p.name, p.matrix_row, s.token
+                FROM people p, encoding_store s
+                ORDER BY p.matrix_row
+            ''')
+            rows = self.cursor.fetchall()
+
+            if not rows:
+                return self._get_encoding_matrix_from_blobs()
+
+            matrix_rows = np.array([row['matrix_row'] for row in rows], dtype=np.int64)
+            if (header != ENCODING_STORE_MAGIC + rows[0]['token']
+                    or matrix_rows.min() < 0 or matrix_rows.max() >= file_rows):
+                return self._get_encoding_matrix_from_blobs()
+
+            store = np.memmap(f, dtype=FACE_ENCODING_DTYPE, mode='r',
+                              offset=ENCODING_STORE_HEADER_BYTES,
+                              shape=(file_rows, FACE_ENCODING_DIM))
+
+        person_ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        names = [row['name'] for row in rows]
+
+        if np.array_equal(matrix_rows, np.arange(len(rows))):
+            # Zero-copy: the sidecar already holds exactly these rows in order
+            return person_ids, names, store[:len(rows)]
+
+        # Rows of people removed since startup leave gaps, so gather the remaining ones
+        return person_ids, names, np.ascontiguousarray(store[matrix_rows])
+
+    def _get_encoding_matrix_from_blobs(self) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Build the (person_ids, names, encodings) matrix from the per-row BLOBs."""
+        self.cursor.execute('SELECT id, name, face_encoding FROM people ORDER BY id')
+        rows = self.cursor.fetchall()
+
+        person_ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        names = [row['name'] for row in rows]
+        encodings = np.frombuffer(b''.join(row['face_encoding'] for row in rows),
+                                  dtype=FACE_ENCODING_DTYPE).reshape(-1, FACE_ENCODING_DIM)
+        return person_ids, names, encodings
+
+    def get_encodings_since(self, max_id: int) -> List[Tuple]:
+        """
+        Get face encodings of people added after a given person ID.
+
+        Args:
+            max_id: Highest person ID already loaded
+
+        Returns:
+            List of tuples (person_id, name, face_encoding)
+        """
+        self.cursor.execute('SELECT id, name, face_encoding FROM people WHERE id > ? ORDER BY id',
+                            (max_id,))
+        return [(person_id, name, self._decode_face(encoding_blob))
+                for person_id, name, encoding_blob in self.cursor.fetchall()]
+
     def _get_person_id(self, name: str) -> Optional[int]:
         """Get person ID by name."""
-        self.cursor.execute('SELECT id FROM people WHERE name = ?', (name,))
+        self.cursor.execute(_SQL_PERSON_ID_BY_NAME, (name,))
         result = self.cursor.fetchone()
         return result[0] if result else None
 
@@ -154,34 +536,37 @@ class DatabaseManager:
 
             today = date.today()
 
-            # Check if attendance already exists for today
-            self.cursor.execute('''
-                SELECT id FROM attendance WHERE person_id = ? AND date = ?
-            ''', (person_id, today))
-
-            existing = self.cursor.fetchone()
-
-            if existing:
-                # Update time_in if earlier, or time_out if later
-                self.cursor.execute('''
-                    UPDATE attendance
-                    SET time_out = ?
-                    WHERE person_id = ? AND date = ?
-                ''', (time_in, person_id, today))
-            else:
-                # Create new attendance record
-                self.cursor.execute('''
-                    INSERT INTO attendance (person_id, date, time_in, status)
-                    VALUES (?, ?, ?, 'present')
-                ''', (person_id, today, time_in))
+            # Create today's record, or update time_out if one already exists
+            self.cursor.execute(_SQL_UPSERT_ATTENDANCE, (person_id, today, time_in))
 
             self.conn.commit()
             return True
         except Exception as e:
+            self.conn.rollback()
             print(f"Error marking attendance: {e}")
             return False
 
-    def get_attendance_by_date(self, target_date: date = None) -> List[Dict]:
+    def get_dashboard_counts(self, today: date = None) -> Tuple[int, int]:
+        """
+        Get the number of people and how many of them are present, in one query.
+
+        Args:
+            today: Date to count attendance for (defaults to today)
+
+        Returns:
+            Tuple of (total_people, present_today)
+        """
+        if today is None:
+            today = date.today()
+
+        self.cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM people),
+                   (SELECT COUNT(*) FROM attendance WHERE date = ?)
+        ''', (today,))
+        total_people, present_today = self.cursor.fetchone()
+        return total_people, present_today
+
+    def get_attendance_by_date(self, target_date: date = None) -> List[sqlite3.Row]:
         """
         Get attendance records for a specific date.
 
@@ -189,31 +574,40 @@ class DatabaseManager:
             target_date: Date to query (defaults to today)
 
         Returns:
-            List of attendance records with person information
+            List of attendance rows (name, role, time_in, time_out, status)
+        """
+        return list(self.iter_attendance_by_date(target_date))
+
+    def iter_attendance_by_date(self, target_date: date = None,
+                                batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """
+        Stream attendance records for a specific date without materializing them all.
+
+        Args:
+            target_date: Date to query (defaults to today)
+            batch_size: Number of rows fetched from SQLite at a time
+
+        Yields:
+            Attendance rows (name, role, time_in, time_out, status)
         """
         if target_date is None:
             target_date = date.today()
 
-        self.cursor.execute('''
-            SELECT p.name, p.role, a.time_in, a.time_out, a.status
-            FROM attendance a
-            JOIN people p ON a.person_id = p.id
-            WHERE a.date = ?
-            ORDER BY p.name
-        ''', (target_date,))
-
-        results = []
-        for row in self.cursor.fetchall():
-            results.append({
-                'name': row[0],
-                'role': row[1],
-                'time_in': row[2],
-                'time_out': row[3],
-                'status': row[4]
-            })
-        return results
+        # Own cursor, so other queries can run while the caller is iterating
+        cursor = self.conn.cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(_SQL_ATTENDANCE_BY_DATE, (target_date,))
 
-    def get_attendance_report(self, start_date: date, end_date: date) -> List[Dict]:
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_attendance_report(self, start_date: date, end_date: date) -> List[sqlite3.Row]:
         """
         Get attendance report for a date range.
 
@@ -222,7 +616,7 @@ class DatabaseManager:
             end_date: End date
 
         Returns:
-            List of attendance records
+            List of attendance rows (name, role, date, time_in, time_out, status)
         """
         self.cursor.execute('''
             SELECT p.name, p.role, a.date, a.time_in, a.time_out, a.status
@@ -232,19 +626,33 @@ class DatabaseManager:
             ORDER BY a.date DESC, p.name
         ''', (start_date, end_date))
 
-        results = []
-        for row in self.cursor.fetchall():
-            results.append({
-                'name': row[0],
-                'role': row[1],
-                'date': row[2],
-                'time_in': row[3],
-                'time_out': row[4],
-                'status': row[5]
-            })
-        return results
+        return self.cursor.fetchall()
+
+    def get_summary_counts(self, start_date: date, end_date: date) -> List[sqlite3.Row]:
+        """
+        Get the number of days present per person for a date range.
+
+        Args:
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            List of rows (name, role, days_present) for every person, ordered by name
+        """
+        # Own cursor, so the report can be built off the main thread
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT p.name, p.role,
+                   COUNT(CASE WHEN a.status = 'present' THEN 1 END) AS days_present
+            FROM people p
+            LEFT JOIN attendance a
+                ON a.person_id = p.id AND a.date BETWEEN ? AND ?
+            GROUP BY p.id
+            ORDER BY p.name
+        ''', (start_date, end_date))
+        return cursor.fetchall()
 
-    def get_person_attendance_history(self, name: str, days: int = 30) -> List[Dict]:
+    def get_person_attendance_history(self, name: str, days: int = 30) -> List[sqlite3.Row]:
         """
         Get attendance history for a specific person.
 
@@ -253,7 +661,7 @@ class DatabaseManager:
             days: Number of days to look back
 
         Returns:
-            List of attendance records
+            List of attendance rows (date, time_in, time_out, status)
         """
         person_id = self._get_person_id(name)
         if person_id is None:
@@ -266,15 +674,7 @@ class DatabaseManager:
             ORDER BY date DESC
         ''', (person_id, days))
 
-        results = []
-        for row in self.cursor.fetchall():
-            results.append({
-                'date': row[0],
-                'time_in': row[1],
-                'time_out': row[2],
-                'status': row[3]
-            })
-        return results
+        return self.cursor.fetchall()
 
     def close(self):
         """Close database connection."""
@@ -1,35 +1,91 @@
 import cv2
+import dlib
 import face_recognition
 import numpy as np
-from typing import List, Tuple, Dict, Callable
+import queue
+import threading
+import time
+from typing import List, Tuple, Dict, Callable, Optional
 from datetime import datetime
 
 
+# Resolution requested from the webcam, and how much it is shrunk for detection
+CAPTURE_WIDTH = 640
+CAPTURE_HEIGHT = 480
+DOWNSCALE_FACTOR = 2
+# Each upsample doubles the detector input, so HOG effectively sees the capture at
+# 2**DETECTION_UPSAMPLE / DOWNSCALE_FACTOR scale. Keep that at 1/2 (the original
+# 0.25x resize + 1 upsample): the 80x80 HOG window then finds faces from ~160 px
+# wide at capture resolution. Change both together.
+DETECTION_UPSAMPLE = 0
+
+
 class FaceRecognizer:
     """Handles real-time face recognition from webcam."""
 
-    def __init__(self, known_faces: List[Tuple[int, str, np.ndarray]], tolerance: float = 0.6):
+    def __init__(self, known_faces: List[Tuple[int, str, np.ndarray]], tolerance: float = 0.6,
+                 detector_model: Optional[str] = None):
         """
         Initialize face recognizer.
 
         Args:
             known_faces: List of tuples (person_id, name, face_encoding)
             tolerance: Face recognition tolerance (lower is more strict)
+            detector_model: Face detector, "hog" or "cnn" (defaults to "cnn" when
+                            dlib was built with CUDA, "hog" otherwise)
         """
-        self.known_face_encodings = [face[2] for face in known_faces]
-        self.known_face_ids = [face[0] for face in known_faces]
-        self.known_face_names = [face[1] for face in known_faces]
+        # Recognized-today flags, one per known face row
+        self.known_face_ids = np.empty(0, dtype=np.int64)
+        self.recognized_mask = np.zeros(0, dtype=bool)
+
+        self._set_known_faces(known_faces)
         self.tolerance = tolerance
-        self.recognized_today = set()
+        if detector_model is None:
+            detector_model = "cnn" if getattr(dlib, "DLIB_USE_CUDA", False) else "hog"
+        self.detector_model = detector_model
+
+        # Pre-rendered stats text, refreshed only when the count changes
+        self._overlay = None
+        self._overlay_mask = None
+        self._overlay_cached_count = -1
+
+        # Downscaled frame buffers, allocated on the first processed frame
+        self._small = None
+        self._gray = None
+        self._rgb = None
+        self._prev_thumbnail = None
+
+    @classmethod
+    def from_encoding_matrix(cls, person_ids: np.ndarray, names: List[str],
+                             encodings: np.ndarray, **kwargs) -> 'FaceRecognizer':
+        """
+        Create a recognizer from an already stacked encoding matrix.
+
+        Args:
+            person_ids: Person IDs, one per row of encodings
+            names: Names, one per row of encodings
+            encodings: (N, 128) float32 matrix, e.g. memory-mapped by
+                       DatabaseManager.get_encoding_matrix (used without copying)
+            **kwargs: Other FaceRecognizer arguments (tolerance, detector_model)
+
+        Returns:
+            FaceRecognizer instance
+        """
+        recognizer = cls([], **kwargs)
+        recognizer._set_known_matrix(person_ids, names, encodings)
+        return recognizer
 
     def recognize_faces_from_webcam(self, on_recognition: Callable[[int, str], None] = None,
-                                    process_every_n_frames: int = 2) -> None:
+                                    process_every_n_frames: int = 2,
+                                    motion_threshold: float = 2.0) -> None:
         """
         Start real-time face recognition from webcam.
 
         Args:
             on_recognition: Callback function called when a face is recognized (person_id, name)
             process_every_n_frames: Process every N frames for better performance
+            motion_threshold: Mean absolute pixel difference against the last processed
+                              frame below which detection is skipped (0 disables gating)
         """
         print("\nStarting webcam face recognition...")
         print("Instructions:")
@@ -44,65 +100,90 @@ class FaceRecognizer:
             print("Error: Could not open webcam!")
             return
 
-        frame_count = 0
+        # Ask the camera for small frames so less needs converting and downscaling
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAPTURE_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAPTURE_HEIGHT)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("Error: Failed to capture frame!")
+        # Capture runs on its own thread so the camera is drained while faces are processed
+        self._stop_event = threading.Event()
+        self._frame_ready = threading.Condition()
+        self._latest_frame = None
+        self._frame_seq = 0
+        self._capture_failed = False
+
+        reader = threading.Thread(target=self._read_frames, args=(cap,), daemon=True)
+        reader.start()
+
+        # Recognition messages are printed by a separate thread so a slow
+        # terminal never stalls the frame loop
+        self._log_queue = queue.Queue()
+        logger = threading.Thread(target=self._drain_log, daemon=True)
+        logger.start()
+
+        frame_count = 0
+        last_seq = 0
+        self._prev_thumbnail = None
+
+        while not self._stop_event.is_set():
+            # Wait for a frame newer than the last one processed (latest frame wins)
+            with self._frame_ready:
+                while self._frame_seq == last_seq and not self._stop_event.is_set():
+                    self._frame_ready.wait(timeout=0.5)
+                frame = self._latest_frame
+                last_seq = self._frame_seq
+
+            if frame is None:
                 break
 
             frame_count += 1
 
-            # Process every N frames to improve performance
-            if frame_count % process_every_n_frames == 0:
-                # Resize frame for faster processing
-                small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-
-                # Detect faces
-                face_locations = face_recognition.face_locations(rgb_small_frame)
-                face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+            # Process every N frames, and only when the scene has changed
+            if (frame_count % process_every_n_frames == 0
+                    and self._scene_changed(frame, motion_threshold)):
+                # Resize frame for faster processing (into buffers reused across frames)
+                small_frame, gray_small_frame, rgb_small_frame = self._get_frame_buffers(frame)
+                cv2.resize(frame, (small_frame.shape[1], small_frame.shape[0]), dst=small_frame)
+                cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY, dst=gray_small_frame)
+                cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=rgb_small_frame)
+
+                # Detect faces (HOG only needs luminance; CNN and encodings need color)
+                detection_frame = gray_small_frame if self.detector_model == "hog" else rgb_small_frame
+                face_locations = face_recognition.face_locations(
+                    detection_frame, number_of_times_to_upsample=DETECTION_UPSAMPLE,
+                    model=self.detector_model
+                )
+                face_encodings = face_recognition.face_encodings(
+                    rgb_small_frame, face_locations, num_jitters=1, model="small"
+                )
 
                 # Process each detected face
-                for face_encoding, face_location in zip(face_encodings, face_locations):
-                    # Compare with known faces
-                    matches = face_recognition.compare_faces(
-                        self.known_face_encodings,
-                        face_encoding,
-                        tolerance=self.tolerance
-                    )
+                matches = self._match_faces(face_encodings)
 
+                for (best_match_index, _), face_location in zip(matches, face_locations):
                     name = "Unknown"
                     person_id = None
                     color = (0, 0, 255)  # Red for unknown
 
                     # Use the known face with the smallest distance
-                    if len(self.known_face_encodings) > 0:
-                        face_distances = face_recognition.face_distance(
-                            self.known_face_encodings,
-                            face_encoding
-                        )
+                    if best_match_index is not None:
+                        name = self.known_face_names[best_match_index]
+                        person_id = int(self.known_face_ids[best_match_index])
+                        color = (0, 255, 0)  # Green for recognized
 
-                        best_match_index = np.argmin(face_distances)
-
-                        if matches[best_match_index]:
-                            name = self.known_face_names[best_match_index]
-                            person_id = self.known_face_ids[best_match_index]
-                            color = (0, 255, 0)  # Green for recognized
-
-                            # Call recognition callback
-                            if on_recognition and person_id not in self.recognized_today:
-                                on_recognition(person_id, name)
-                                self.recognized_today.add(person_id)
-                                print(f"✓ Recognized: {name} at {datetime.now().strftime('%H:%M:%S')}")
+                        # Call recognition callback
+                        if on_recognition and not self.recognized_mask[best_match_index]:
+                            on_recognition(person_id, name)
+                            self.recognized_mask[best_match_index] = True
+                            self._log_queue.put_nowait((name, time.time()))
 
                     # Scale back up face locations
                     top, right, bottom, left = face_location
-                    top *= 4
-                    right *= 4
-                    bottom *= 4
-                    left *= 4
+                    top *= DOWNSCALE_FACTOR
+                    right *= DOWNSCALE_FACTOR
+                    bottom *= DOWNSCALE_FACTOR
+                    left *= DOWNSCALE_FACTOR
 
                     # Draw rectangle around face
                     cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
@@ -113,10 +194,7 @@ class FaceRecognizer:
                                cv2.FONT_HERSHEY_DUPLEX, 0.6, (255, 255, 255), 1)
 
             # Show stats
-            cv2.putText(frame, f"Recognized Today: {len(self.recognized_today)}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(frame, "Press 'q' or ESC to quit", (10, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            self._draw_stats_overlay(frame)
 
             # Display frame
             cv2.imshow('Attendance System - Face Recognition', frame)
@@ -127,9 +205,109 @@ class FaceRecognizer:
                 print("\nStopping recognition...")
                 break
 
+        self._stop_event.set()
+        reader.join(timeout=1.0)
+
+        # Flush pending recognition messages before the session summary
+        self._log_queue.put_nowait(None)
+        logger.join()
+
+        if self._capture_failed:
+            print("Error: Failed to capture frame!")
+
         cap.release()
         cv2.destroyAllWindows()
-        print(f"\nSession complete. Total recognized: {len(self.recognized_today)}")
+        print(f"\nSession complete. Total recognized: {self.recognized_count}")
+
+    def _scene_changed(self, frame: np.ndarray, threshold: float) -> bool:
+        """
+        Check whether a frame differs enough from the last processed one to run detection.
+
+        Args:
+            frame: Full-size webcam frame
+            threshold: Minimum mean absolute difference of an 80x60 grayscale thumbnail
+
+        Returns:
+            True if the frame should be processed
+        """
+        thumbnail = cv2.cvtColor(cv2.resize(frame, (80, 60)), cv2.COLOR_BGR2GRAY)
+
+        if (self._prev_thumbnail is not None
+                and cv2.absdiff(thumbnail, self._prev_thumbnail).mean() < threshold):
+            return False
+
+        self._prev_thumbnail = thumbnail
+        return True
+
+    def _get_frame_buffers(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the reusable downscaled BGR, grayscale and RGB buffers for a frame.
+
+        Args:
+            frame: Full-size webcam frame
+
+        Returns:
+            Tuple of (small_bgr, small_gray, small_rgb) buffers
+        """
+        small_shape = (frame.shape[0] // DOWNSCALE_FACTOR, frame.shape[1] // DOWNSCALE_FACTOR, 3)
+
+        if self._small is None or self._small.shape != small_shape:
+            self._small = np.empty(small_shape, dtype=np.uint8)
+            self._gray = np.empty(small_shape[:2], dtype=np.uint8)
+            self._rgb = np.empty_like(self._small)
+
+        return self._small, self._gray, self._rgb
+
+    def _draw_stats_overlay(self, frame: np.ndarray):
+        """
+        Copy the cached stats text onto the top of the frame.
+
+        Args:
+            frame: Frame to draw on (modified in place)
+        """
+        count = self.recognized_count
+        height, width = 70, frame.shape[1]
+
+        if (count != self._overlay_cached_count or self._overlay is None
+                or self._overlay.shape[1] != width):
+            self._overlay = np.zeros((height, width, 3), dtype=np.uint8)
+            cv2.putText(self._overlay, f"Recognized Today: {count}", (10, 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.putText(self._overlay, "Press 'q' or ESC to quit", (10, 60),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            self._overlay_mask = self._overlay.any(axis=2)[:, :, None]
+            self._overlay_cached_count = count
+
+        np.copyto(frame[:height], self._overlay, where=self._overlay_mask)
+
+    def _read_frames(self, cap: cv2.VideoCapture):
+        """
+        Continuously read frames from the webcam into the single-slot frame buffer.
+
+        Args:
+            cap: Opened video capture device
+        """
+        while not self._stop_event.is_set():
+            ret, frame = cap.read()
+
+            with self._frame_ready:
+                if not ret:
+                    self._capture_failed = True
+                    self._stop_event.set()
+                else:
+                    # cap.read() returns a new array each time, so no copy is needed
+                    self._latest_frame = frame
+                    self._frame_seq += 1
+                self._frame_ready.notify()
+
+    def _drain_log(self):
+        """Print queued (name, timestamp) recognition messages until a None sentinel arrives."""
+        while True:
+            entry = self._log_queue.get()
+            if entry is None:
+                break
+            name, timestamp = entry
+            print(f"✓ Recognized: {name} at {datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')}")
 
     def recognize_face_from_frame(self, frame: np.ndarray) -> List[Dict]:
         """
@@ -144,35 +322,22 @@ class FaceRecognizer:
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
         # Detect faces
-        face_locations = face_recognition.face_locations(rgb_frame)
+        face_locations = face_recognition.face_locations(rgb_frame, model=self.detector_model)
         face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
 
         results = []
 
-        for face_encoding, face_location in zip(face_encodings, face_locations):
-            # Compare with known faces
-            matches = face_recognition.compare_faces(
-                self.known_face_encodings,
-                face_encoding,
-                tolerance=self.tolerance
-            )
+        matches = self._match_faces(face_encodings)
 
+        for (best_match_index, distance), face_location in zip(matches, face_locations):
             name = "Unknown"
             person_id = None
             confidence = 0.0
 
-            if len(self.known_face_encodings) > 0:
-                face_distances = face_recognition.face_distance(
-                    self.known_face_encodings,
-                    face_encoding
-                )
-
-                best_match_index = np.argmin(face_distances)
-
-                if matches[best_match_index]:
-                    name = self.known_face_names[best_match_index]
-                    person_id = self.known_face_ids[best_match_index]
-                    confidence = 1 - face_distances[best_match_index]
+            if best_match_index is not None:
+                name = self.known_face_names[best_match_index]
+                person_id = int(self.known_face_ids[best_match_index])
+                confidence = 1 - distance
 
             results.append({
                 'person_id': person_id,
@@ -183,17 +348,121 @@ class FaceRecognizer:
 
         return results
 
+    def _match_faces(self, face_encodings: List[np.ndarray]) -> List[Tuple[Optional[int], float]]:
+        """
+        Find the closest known face for every detected face in one batch.
+
+        Squared distances are expanded as |a|^2 + |b|^2 - 2ab so the whole
+        (M faces x N known) comparison is a single matrix multiplication.
+
+        Args:
+            face_encodings: Face encodings detected in a frame
+
+        Returns:
+            List of (index, distance) per face; index is None if no face is within tolerance
+        """
+        if len(face_encodings) == 0:
+            return []
+        if len(self.known_face_encodings) == 0:
+            return [(None, float('inf'))] * len(face_encodings)
+
+        encodings = np.asarray(face_encodings, dtype=np.float32)
+        rows = np.arange(len(encodings))
+
+        dots = encodings @ self.known_face_encodings.T
+        sq_distances = (self.known_face_sq_norms[None, :]
+                        + (encodings * encodings).sum(axis=1, keepdims=True)
+                        - 2 * dots)
+        best_indices = sq_distances.argmin(axis=1)
+        best_sq = sq_distances[rows, best_indices]
+
+        distances = np.sqrt(np.maximum(best_sq, 0))
+
+        return [
+            (int(index) if distance <= self.tolerance else None, float(distance))
+            for index, distance in zip(best_indices, distances)
+        ]
+
     def reset_recognition_cache(self):
         """Reset the cache of recognized faces for the day."""
-        self.recognized_today.clear()
+        self.recognized_mask[:] = False
 
-    def update_known_faces(self, known_faces: List[Tuple[int, str, np.ndarray]]):
+    def update_known_faces(self, known_faces: List[Tuple[int, str, np.ndarray]],
+                           append: bool = False):
         """
         Update the list of known faces.
 
+        Args:
+            known_faces: List of tuples (person_id, name, face_encoding)
+            append: Add known_faces to the existing ones instead of replacing them
+                    (use with DatabaseManager.get_encodings_since after registrations)
+        """
+        if not append:
+            self._set_known_faces(known_faces)
+            return
+
+        if not known_faces:
+            return
+
+        encodings, sq_norms, ids, names = self._stack_known_faces(known_faces)
+        self.known_face_encodings = np.vstack([self.known_face_encodings, encodings])
+        self.known_face_sq_norms = np.concatenate([self.known_face_sq_norms, sq_norms])
+        self.known_face_ids = np.concatenate([self.known_face_ids, ids])
+        self.known_face_names = np.concatenate([self.known_face_names, names])
+        self.recognized_mask = np.concatenate([self.recognized_mask, np.zeros(len(ids), dtype=bool)])
+
+    @property
+    def recognized_count(self) -> int:
+        """Number of known faces recognized since the last reset."""
+        return int(np.count_nonzero(self.recognized_mask))
+
+    @property
+    def max_known_id(self) -> int:
+        """Highest person ID among the known faces (0 if there are none)."""
+        return int(self.known_face_ids.max()) if len(self.known_face_ids) > 0 else 0
+
+    def _set_known_faces(self, known_faces: List[Tuple[int, str, np.ndarray]]):
+        """
+        Store known faces as parallel arrays with one contiguous encoding matrix.
+
+        Args:
+            known_faces: List of tuples (person_id, name, face_encoding)
+        """
+        encodings, _, ids, names = self._stack_known_faces(known_faces)
+        self._set_known_matrix(ids, names, encodings)
+
+    def _set_known_matrix(self, person_ids: np.ndarray, names: List[str], encodings: np.ndarray):
+        """
+        Store an encoding matrix and its parallel id/name arrays.
+
+        Args:
+            person_ids: Person IDs, one per row of encodings
+            names: Names, one per row of encodings
+            encodings: (N, 128) encoding matrix (kept as-is if already float32)
+        """
+        # Carry recognized flags over by person ID, since row indices may change
+        recognized_ids = self.known_face_ids[self.recognized_mask]
+
+        self.known_face_encodings = np.asarray(encodings, dtype=np.float32)
+        self.known_face_sq_norms = (self.known_face_encodings ** 2).sum(axis=1)
+        self.known_face_ids = np.asarray(person_ids, dtype=np.int64)
+        self.known_face_names = np.array(names, dtype=object)
+        self.recognized_mask = np.isin(self.known_face_ids, recognized_ids)
+
+    @staticmethod
+    def _stack_known_faces(known_faces: List[Tuple[int, str, np.ndarray]]
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert known faces into (encodings, squared norms, ids, names) arrays.
+
         Args:
             known_faces: List of tuples (person_id, name, face_encoding)
         """
-        self.known_face_encodings = [face[2] for face in known_faces]
-        self.known_face_ids = [face[0] for face in known_faces]
-        self.known_face_names = [face[1] for face in known_faces]
+        if known_faces:
+            encodings = np.vstack([face[2] for face in known_faces]).astype(np.float32, copy=False)
+        else:
+            encodings = np.empty((0, 128), dtype=np.float32)
+        sq_norms = (encodings ** 2).sum(axis=1)
+        ids = np.array([face[0] for face in known_faces], dtype=np.int64)
+        names = np.array([face[1] for face in known_faces], dtype=object)
+        return encodings, sq_norms, ids, names
@@ -1,8 +1,18 @@
 from database import DatabaseManager
 from face_module import FaceRegistrar, FaceRecognizer
 from utils import AttendanceReporter
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, date, timedelta
 import os
+import sys
+
+
+# Number of people listed at a time in selection menus
+PEOPLE_PAGE_SIZE = 50
+# Maximum number of name-prefix matches shown when searching
+PEOPLE_SEARCH_LIMIT = 20
+# Seconds between progress dots while a report is generated in the background
+REPORT_PROGRESS_INTERVAL = 0.2
 
 
 class CLIInterface:
@@ -13,10 +23,45 @@ class CLIInterface:
         self.db = DatabaseManager()
         self.face_registrar = FaceRegistrar()
         self.reporter = AttendanceReporter(self.db)
+        # Runs slow report queries so the menu can show progress meanwhile
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        # (people version, (person_ids, names, encodings)) from the last monitoring session
+        self._faces_cache = None
+        # "Today" as of the current menu iteration, shared by every menu action
+        self._today = date.today()
+        self._stdout_is_tty = sys.stdout.isatty()
+        self._ansi_supported = self._stdout_is_tty and self._enable_ansi()
 
     def clear_screen(self):
         """Clear the terminal screen."""
-        os.system('clear' if os.name != 'nt' else 'cls')
+        if not self._stdout_is_tty:
+            return
+
+        if self._ansi_supported:
+            # Cursor home + erase display, without spawning a shell
+            sys.stdout.write('\x1b[H\x1b[2J')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
+
+    @staticmethod
+    def _enable_ansi() -> bool:
+        """Make sure the console understands ANSI escapes (Windows 10+ needs VT mode)."""
+        if os.name != 'nt':
+            return True
+
+        try:
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                return False
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+        except Exception:
+            return False
 
     def print_header(self):
         """Print application header."""
@@ -26,27 +71,31 @@ class CLIInterface:
 
     def print_menu(self):
         """Print main menu."""
-        stats = self.reporter.get_statistics()
-
-        print(f"\nSystem Statistics:")
-        print(f"  Total People: {stats['total_people']}")
-        print(f"  Present Today: {stats['present_today']}")
-        print(f"  Absent Today: {stats['absent_today']}")
-
-        print("\n" + "-"*70)
-        print("MAIN MENU:")
-        print("-"*70)
-        print("1. Start Attendance Monitoring (Webcam)")
-        print("2. Add New Person")
-        print("3. Remove Person")
-        print("4. View All People")
-        print("5. View Today's Attendance")
-        print("6. View Person Attendance History")
-        print("7. View Attendance Summary Report")
-        print("8. Export Today's Attendance to CSV")
-        print("9. Manual Attendance Entry")
-        print("0. Exit")
-        print("-"*70)
+        stats = self.reporter.get_statistics(self._today)
+
+        # Build the whole menu and write it at once
+        out = [
+            "\nSystem Statistics:",
+            f"  Total People: {stats['total_people']}",
+            f"  Present Today: {stats['present_today']}",
+            f"  Absent Today: {stats['absent_today']}",
+            "\n" + "-"*70,
+            "MAIN MENU:",
+            "-"*70,
+            "1. Start Attendance Monitoring (Webcam)",
+            "2. Add New Person",
+            "3. Remove Person",
+            "4. View All People",
+            "5. View Today's Attendance",
+            "6. View Person Attendance History",
+            "7. View Attendance Summary Report",
+            "8. Export Today's Attendance to CSV",
+            "9. Manual Attendance Entry",
+            "0. Exit",
+            "-"*70,
+        ]
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
     def add_person_menu(self):
         """Handle adding a new person."""
@@ -108,6 +157,8 @@ class CLIInterface:
 
         # Add to database
         if self.db.add_person(name, role, face_encoding, image_path):
+            self.reporter.invalidate()
+            self._faces_cache = None
             print(f"\n✓ Successfully added {name} ({role}) to the database!")
         else:
             print(f"\n✗ Failed to add {name} to the database!")
@@ -118,33 +169,89 @@ class CLIInterface:
         print("REMOVE PERSON")
         print("="*70)
 
-        # Show all people
-        people = self.db.get_all_people()
+        query = input("\nEnter name or prefix (blank to list all, 'cancel' to go back): ").strip()
 
-        if not people:
-            print("\nNo people in the database!")
+        if query.lower() == 'cancel':
             return
 
-        print("\nCurrent people in database:")
-        for idx, person in enumerate(people, 1):
-            print(f"{idx}. {person[1]} ({person[2]})")
+        if not query:
+            # Show people a page at a time
+            choice, people = self._browse_people(
+                "Current people in database:",
+                "Enter person name to remove (or 'cancel' to go back)"
+            )
 
-        choice = input("\nEnter person name to remove (or 'cancel' to go back): ").strip()
+            if not people:
+                print("\nNo people in the database!")
+                return
+        elif self.db.get_person_by_name(query) is not None:
+            choice = query
+        else:
+            matches = self.db.search_people(query, limit=PEOPLE_SEARCH_LIMIT)
+
+            if not matches:
+                print(f"No people found matching '{query}'.")
+                return
+
+            print("\nMatching people:")
+            for idx, person in enumerate(matches, 1):
+                print(f"{idx}. {person[1]} ({person[2]})")
+            if len(matches) == PEOPLE_SEARCH_LIMIT:
+                print(f"(showing the first {PEOPLE_SEARCH_LIMIT} matches)")
+
+            choice = input("\nEnter person name to remove (or 'cancel' to go back): ").strip()
 
         if choice.lower() == 'cancel':
             return
 
+        if self.db.get_person_by_name(choice) is None:
+            print(f"Error: Person '{choice}' not found!")
+            return
+
         # Confirm deletion
         confirm = input(f"\nAre you sure you want to remove '{choice}'? (yes/no): ").strip().lower()
 
         if confirm == 'yes':
             if self.db.remove_person(choice):
+                self.reporter.invalidate()
+                self._faces_cache = None
                 print(f"\n✓ Successfully removed {choice} from the database!")
             else:
                 print(f"\n✗ Failed to remove {choice}!")
         else:
             print("Removal cancelled.")
 
+    def _browse_people(self, header: str, prompt: str):
+        """
+        List people a page at a time until the user enters a choice.
+
+        Args:
+            header: Line printed above the list
+            prompt: Input prompt shown after each page
+
+        Returns:
+            Tuple of (choice, people listed so far); people is empty if there is nobody
+        """
+        pages = self.db.iter_people(PEOPLE_PAGE_SIZE)
+        shown = []
+        page = next(pages, [])
+
+        if not page:
+            return "", shown
+
+        print(f"\n{header}")
+        while True:
+            for idx, person in enumerate(page, len(shown) + 1):
+                print(f"{idx}. {person[1]} ({person[2]})")
+            shown.extend(page)
+
+            page = next(pages, [])
+            more = " (or press Enter to show more)" if page else ""
+            choice = input(f"\n{prompt}{more}: ").strip()
+
+            if choice or not page:
+                return choice, shown
+
     def view_all_people_menu(self):
         """Display all people in the database."""
         print("\n" + "="*70)
@@ -157,15 +264,16 @@ class CLIInterface:
             print("\nNo people in the database!")
             return
 
-        print(f"\n{'ID':<5} {'Name':<25} {'Role':<15} {'Added On':<20}")
-        print("-"*70)
+        row_fmt = "{:<5} {:<25} {:<15} {:<20}".format
+        lines = ["\n" + row_fmt('ID', 'Name', 'Role', 'Added On'), "-"*70]
 
-        for person in people:
-            person_id, name, role, created_at = person
-            created_date = datetime.fromisoformat(created_at).strftime('%Y-%m-%d %H:%M')
-            print(f"{person_id:<5} {name:<25} {role:<15} {created_date:<20}")
+        for person_id, name, role, created_at in people:
+            # created_at is stored as 'YYYY-MM-DD HH:MM:SS'; keep up to the minute
+            lines.append(row_fmt(person_id, name, role, created_at[:16].replace('T', ' ')))
 
-        print(f"\nTotal: {len(people)} people")
+        lines.append(f"\nTotal: {len(people)} people")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
     def start_monitoring_menu(self):
         """Start webcam attendance monitoring."""
@@ -173,27 +281,37 @@ class CLIInterface:
         print("STARTING ATTENDANCE MONITORING")
         print("="*70)
 
-        # Load all known faces
-        known_faces = self.db.get_all_face_encodings()
+        # Load all known faces as one (N, 128) matrix
+        person_ids, names, encodings = self._load_known_faces()
 
-        if not known_faces:
+        if len(person_ids) == 0:
             print("\nNo people in the database! Please add people first.")
             return
 
-        print(f"\nLoaded {len(known_faces)} known faces.")
+        print(f"\nLoaded {len(person_ids)} known faces.")
 
         # Define recognition callback
         def on_person_recognized(person_id: int, name: str):
             """Called when a person is recognized."""
             self.db.mark_attendance(person_id)
+            self.reporter.invalidate()
 
         # Start recognition
-        recognizer = FaceRecognizer(known_faces)
+        recognizer = FaceRecognizer.from_encoding_matrix(person_ids, names, encodings)
         recognizer.recognize_faces_from_webcam(on_recognition=on_person_recognized)
 
+    def _load_known_faces(self):
+        """Get the known-face matrix, reusing the last one if the people table is unchanged."""
+        version = self.db.get_people_version()
+
+        if self._faces_cache is None or self._faces_cache[0] != version:
+            self._faces_cache = (version, self.db.get_encoding_matrix())
+
+        return self._faces_cache[1]
+
     def view_today_attendance_menu(self):
         """View today's attendance."""
-        self.reporter.print_daily_report()
+        self.reporter.print_daily_report(self._today)
         input("\nPress Enter to continue...")
 
     def view_person_history_menu(self):
@@ -207,8 +325,13 @@ class CLIInterface:
             print("Error: Name cannot be empty!")
             return
 
-        days = input("Enter number of days to look back (default 30): ").strip()
-        days = int(days) if days.isdigit() else 30
+        days_str = input("Enter number of days to look back (default 30): ").strip()
+        try:
+            days = int(days_str)
+        except ValueError:
+            days = 30
+        if days < 0:
+            days = 30
 
         self.reporter.print_person_history(name, days)
         input("\nPress Enter to continue...")
@@ -227,7 +350,7 @@ class CLIInterface:
 
         choice = input("\nEnter choice (1-4): ").strip()
 
-        today = date.today()
+        today = self._today
 
         if choice == '1':
             start_date = today - timedelta(days=7)
@@ -251,7 +374,17 @@ class CLIInterface:
             print("Invalid choice!")
             return
 
-        self.reporter.print_summary_report(start_date, end_date)
+        future = self._pool.submit(self.reporter.build_summary_report, start_date, end_date)
+
+        # Only show progress when the report takes noticeably long
+        if wait((future,), timeout=REPORT_PROGRESS_INTERVAL).not_done:
+            sys.stdout.write("\nGenerating report")
+            while wait((future,), timeout=REPORT_PROGRESS_INTERVAL).not_done:
+                sys.stdout.write(".")
+                sys.stdout.flush()
+
+        sys.stdout.write("\n".join(future.result()) + "\n")
+        sys.stdout.flush()
         input("\nPress Enter to continue...")
 
     def export_csv_menu(self):
@@ -260,7 +393,7 @@ class CLIInterface:
         print("EXPORT ATTENDANCE TO CSV")
         print("="*70)
 
-        target_date = date.today()
+        target_date = self._today
         print(f"\nExporting attendance for {target_date.strftime('%Y-%m-%d')}...")
 
         if self.reporter.export_to_csv(target_date):
@@ -276,28 +409,29 @@ class CLIInterface:
         print("MANUAL ATTENDANCE ENTRY")
         print("="*70)
 
-        # Show all people
-        people = self.db.get_all_people()
+        # Show people a page at a time
+        choice, people = self._browse_people("Select person:", "Enter person number")
 
         if not people:
             print("\nNo people in the database!")
             return
 
-        print("\nSelect person:")
-        for idx, person in enumerate(people, 1):
-            print(f"{idx}. {person[1]} ({person[2]})")
-
-        choice = input("\nEnter person number: ").strip()
+        try:
+            number = int(choice)
+        except ValueError:
+            print("Invalid choice!")
+            return
 
-        if not choice.isdigit() or int(choice) < 1 or int(choice) > len(people):
+        if not 1 <= number <= len(people):
             print("Invalid choice!")
             return
 
-        person = people[int(choice) - 1]
+        person = people[number - 1]
         person_id = person[0]
         name = person[1]
 
         if self.db.mark_attendance(person_id):
+            self.reporter.invalidate()
             print(f"\n✓ Attendance marked for {name}!")
         else:
             print(f"\n✗ Failed to mark attendance for {name}!")
@@ -307,6 +441,7 @@ class CLIInterface:
     def run(self):
         """Run the main application loop."""
         while True:
+            self._today = date.today()
             self.clear_screen()
             self.print_header()
             self.print_menu()
@@ -315,6 +450,7 @@ class CLIInterface:
 
             if choice == '0':
                 print("\nThank you for using Webcam Attendance System!")
+                self._pool.shutdown()
                 self.db.close()
                 break
             elif choice == '1':
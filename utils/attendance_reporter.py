@@ -1,8 +1,43 @@
-from datetime import date, datetime, timedelta
-from typing import List, Dict
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List
 from database import DatabaseManager
 import csv
+import io
 import os
+import sys
+import time
+
+import numpy as np
+
+
+# How long menu statistics are reused before querying the database again
+STATS_CACHE_TTL = 5.0
+
+# Pre-formatted CSV header row (csv.writer's default \r\n line terminator)
+_CSV_HEADER = "Name,Role,Date,Time In,Time Out,Status\r\n"
+
+# Keep Windows from translating newlines at the file-descriptor level
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+
+def _format_time(iso_timestamp: str) -> str:
+    """Format a stored 'YYYY-MM-DD HH:MM:SS[.ffffff]' timestamp as 'HH:MM:SS AM/PM'."""
+    return _format_clock(iso_timestamp[11:19])
+
+
+@lru_cache(maxsize=1024)
+def _format_clock(clock: str) -> str:
+    """Convert a 24-hour 'HH:MM:SS' string to 12-hour 'HH:MM:SS AM/PM'."""
+    hour = int(clock[0:2])
+    am_pm = 'AM' if hour < 12 else 'PM'
+    return f"{hour % 12 or 12:02d}:{clock[3:5]}:{clock[6:8]} {am_pm}"
+
+
+def _write_lines(lines: List[str]):
+    """Write a whole report to stdout in one call instead of one print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 class AttendanceReporter:
@@ -16,6 +51,8 @@ class AttendanceReporter:
             db_manager: Database manager instance
         """
         self.db = db_manager
+        # (monotonic timestamp, date, statistics) of the last get_statistics call
+        self._stats_cache = None
 
     def print_daily_report(self, target_date: date = None):
         """
@@ -27,33 +64,40 @@ class AttendanceReporter:
         if target_date is None:
             target_date = date.today()
 
-        print(f"\n{'='*70}")
-        print(f"ATTENDANCE REPORT - {target_date.strftime('%A, %B %d, %Y')}")
-        print(f"{'='*70}")
-
-        attendance_records = self.db.get_attendance_by_date(target_date)
+        out = [
+            f"\n{'='*70}",
+            f"ATTENDANCE REPORT - {target_date.strftime('%A, %B %d, %Y')}",
+            f"{'='*70}",
+        ]
+
+        # Records (streamed from the database)
+        present = 0
+        for record in self.db.iter_attendance_by_date(target_date):
+            if present == 0:
+                # Header
+                out.append(f"\n{'Name':<25} {'Role':<15} {'Time In':<20} {'Status':<10}")
+                out.append("-" * 70)
+            present += 1
 
-        if not attendance_records:
-            print("No attendance records found for this date.")
-            return
-
-        # Header
-        print(f"\n{'Name':<25} {'Role':<15} {'Time In':<20} {'Status':<10}")
-        print("-" * 70)
-
-        # Records
-        for record in attendance_records:
             time_in = record['time_in']
             if time_in:
-                time_in_str = datetime.fromisoformat(time_in).strftime('%I:%M:%S %p')
+                time_in_str = _format_time(time_in)
             else:
                 time_in_str = "N/A"
 
-            print(f"{record['name']:<25} {record['role']:<15} {time_in_str:<20} {record['status']:<10}")
+            # ljust + concatenation skips the format-spec parser on every field
+            out.append(record['name'].ljust(25) + " " + record['role'].ljust(15) + " "
+                       + time_in_str.ljust(20) + " " + record['status'].ljust(10))
+
+        if present == 0:
+            out.append("No attendance records found for this date.")
+            _write_lines(out)
+            return
 
-        print("-" * 70)
-        print(f"Total Present: {len(attendance_records)}")
-        print()
+        out.append("-" * 70)
+        out.append(f"Total Present: {present}")
+        out.append("")
+        _write_lines(out)
 
     def print_person_history(self, name: str, days: int = 30):
         """
@@ -63,40 +107,45 @@ class AttendanceReporter:
             name: Person's name
             days: Number of days to look back
         """
-        print(f"\n{'='*70}")
-        print(f"ATTENDANCE HISTORY - {name} (Last {days} days)")
-        print(f"{'='*70}")
+        out = [
+            f"\n{'='*70}",
+            f"ATTENDANCE HISTORY - {name} (Last {days} days)",
+            f"{'='*70}",
+        ]
 
         history = self.db.get_person_attendance_history(name, days)
 
         if not history:
-            print(f"No attendance records found for {name}.")
+            out.append(f"No attendance records found for {name}.")
+            _write_lines(out)
             return
 
         # Header
-        print(f"\n{'Date':<15} {'Time In':<20} {'Time Out':<20} {'Status':<10}")
-        print("-" * 70)
+        out.append(f"\n{'Date':<15} {'Time In':<20} {'Time Out':<20} {'Status':<10}")
+        out.append("-" * 70)
 
         # Records
         present_days = 0
         for record in history:
-            record_date = datetime.strptime(record['date'], '%Y-%m-%d').strftime('%Y-%m-%d')
+            record_date = record['date']
 
             time_in = record['time_in']
-            time_in_str = datetime.fromisoformat(time_in).strftime('%I:%M:%S %p') if time_in else "N/A"
+            time_in_str = _format_time(time_in) if time_in else "N/A"
 
             time_out = record['time_out']
-            time_out_str = datetime.fromisoformat(time_out).strftime('%I:%M:%S %p') if time_out else "N/A"
+            time_out_str = _format_time(time_out) if time_out else "N/A"
 
-            print(f"{record_date:<15} {time_in_str:<20} {time_out_str:<20} {record['status']:<10}")
+            out.append(record_date.ljust(15) + " " + time_in_str.ljust(20) + " "
+                       + time_out_str.ljust(20) + " " + record['status'].ljust(10))
 
             if record['status'] == 'present':
                 present_days += 1
 
-        print("-" * 70)
-        print(f"Total Days Present: {present_days}/{len(history)}")
-        print(f"Attendance Rate: {(present_days/len(history)*100):.1f}%")
-        print()
+        out.append("-" * 70)
+        out.append(f"Total Days Present: {present_days}/{len(history)}")
+        out.append(f"Attendance Rate: {(present_days/len(history)*100):.1f}%")
+        out.append("")
+        _write_lines(out)
 
     def print_summary_report(self, start_date: date, end_date: date):
         """
@@ -106,41 +155,49 @@ class AttendanceReporter:
             start_date: Start date
             end_date: End date
         """
-        print(f"\n{'='*70}")
-        print(f"ATTENDANCE SUMMARY REPORT")
-        print(f"{start_date.strftime('%B %d, %Y')} to {end_date.strftime('%B %d, %Y')}")
-        print(f"{'='*70}")
-
-        all_people = self.db.get_all_people()
-        attendance_records = self.db.get_attendance_report(start_date, end_date)
-
-        # Group by person
-        person_stats = {}
-        for person in all_people:
-            person_id, name, role, _ = person
-            person_stats[name] = {
-                'role': role,
-                'days_present': 0,
-                'total_days': (end_date - start_date).days + 1
-            }
-
-        for record in attendance_records:
-            name = record['name']
-            if name in person_stats and record['status'] == 'present':
-                person_stats[name]['days_present'] += 1
+        _write_lines(self.build_summary_report(start_date, end_date))
+
+    def build_summary_report(self, start_date: date, end_date: date) -> List[str]:
+        """
+        Build the summary report lines for a date range without printing them.
+
+        Args:
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Report lines, one string per printed line
+        """
+        # Range-wide values, computed once rather than per person
+        total_days = (end_date - start_date).days + 1
+        total_days_str = str(total_days).ljust(10)
+        range_label = f"{start_date.strftime('%B %d, %Y')} to {end_date.strftime('%B %d, %Y')}"
+
+        out = [
+            f"\n{'='*70}",
+            "ATTENDANCE SUMMARY REPORT",
+            range_label,
+            f"{'='*70}",
+        ]
+
+        # Days present per person, aggregated in SQL
+        summary_rows = self.db.get_summary_counts(start_date, end_date)
 
         # Print summary
-        print(f"\n{'Name':<25} {'Role':<15} {'Days Present':<15} {'Rate':<10}")
-        print("-" * 70)
+        out.append(f"\n{'Name':<25} {'Role':<15} {'Days Present':<15} {'Rate':<10}")
+        out.append("-" * 70)
 
-        for name, stats in sorted(person_stats.items()):
-            days_present = stats['days_present']
-            total_days = stats['total_days']
-            rate = (days_present / total_days * 100) if total_days > 0 else 0
+        # Rows come back ordered by name, so only the rates need computing
+        days = np.fromiter((row['days_present'] for row in summary_rows), dtype=np.int64,
+                           count=len(summary_rows))
+        rates = days / total_days * 100.0 if total_days > 0 else np.zeros(len(days))
 
-            print(f"{name:<25} {stats['role']:<15} {days_present}/{total_days:<10} {rate:>6.1f}%")
+        for (name, role, days_present), rate in zip(summary_rows, rates.tolist()):
+            out.append(name.ljust(25) + " " + role.ljust(15) + " " + str(days_present) + "/"
+                       + total_days_str + " " + f"{rate:>6.1f}%")
 
-        print()
+        out.append("")
+        return out
 
     def export_to_csv(self, target_date: date, output_path: str = None):
         """
@@ -154,23 +211,23 @@ class AttendanceReporter:
             os.makedirs("reports", exist_ok=True)
             output_path = f"reports/attendance_{target_date.strftime('%Y%m%d')}.csv"
 
-        attendance_records = self.db.get_attendance_by_date(target_date)
+        attendance_records = self.db.iter_attendance_by_date(target_date)
+        date_str = target_date.strftime('%Y-%m-%d')
 
         try:
-            with open(output_path, 'w', newline='') as csvfile:
-                fieldnames = ['Name', 'Role', 'Date', 'Time In', 'Time Out', 'Status']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                for record in attendance_records:
-                    writer.writerow({
-                        'Name': record['name'],
-                        'Role': record['role'],
-                        'Date': target_date.strftime('%Y-%m-%d'),
-                        'Time In': record['time_in'] or '',
-                        'Time Out': record['time_out'] or '',
-                        'Status': record['status']
-                    })
+            # Raw fd + explicit wrapper skips open()'s isatty/locale probing
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+            raw = os.fdopen(fd, 'wb', buffering=1 << 20)
+
+            with io.TextIOWrapper(raw, encoding='utf-8', newline='', write_through=False) as csvfile:
+                writer = csv.writer(csvfile)
+
+                csvfile.write(_CSV_HEADER)
+                writer.writerows(
+                    (record['name'], record['role'], date_str,
+                     record['time_in'] or '', record['time_out'] or '', record['status'])
+                    for record in attendance_records
+                )
 
             print(f"Report exported to: {output_path}")
             return True
@@ -179,18 +236,35 @@ class AttendanceReporter:
             print(f"Error exporting to CSV: {e}")
             return False
 
-    def get_statistics(self) -> Dict:
+    def get_statistics(self, today: date = None) -> Dict:
         """
         Get overall system statistics.
 
+        Args:
+            today: Date to count attendance for (defaults to today)
+
         Returns:
             Dictionary with system statistics
         """
-        all_people = self.db.get_all_people()
-        today_attendance = self.db.get_attendance_by_date(date.today())
+        if today is None:
+            today = date.today()
+        now = time.monotonic()
+
+        if self._stats_cache is not None:
+            cached_at, cached_date, stats = self._stats_cache
+            if cached_date == today and now - cached_at < STATS_CACHE_TTL:
+                return stats
 
-        return {
-            'total_people': len(all_people),
-            'present_today': len(today_attendance),
-            'absent_today': len(all_people) - len(today_attendance)
+        total_people, present_today = self.db.get_dashboard_counts(today)
+
+        stats = {
+            'total_people': total_people,
+            'present_today': present_today,
+            'absent_today': total_people - present_today
         }
+        self._stats_cache = (now, today, stats)
+        return stats
+
+    def invalidate(self):
+        """Drop cached statistics after people or attendance records change."""
+        self._stats_cache = None